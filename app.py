@@ -16,6 +16,7 @@ import time
 from datetime import timedelta
 import secrets
 from dotenv import load_dotenv
+from werkzeug.middleware.proxy_fix import ProxyFix
 
 # Load .env from project directory (works on both Windows and Linux)
 load_dotenv(os.path.join(os.path.dirname(os.path.abspath(__file__)), '.env'))
@@ -24,7 +25,7 @@ load_dotenv(os.path.join(os.path.dirname(os.path.abspath(__file__)), '.env'))
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'backend'))
 
 from backend.tournament import TournamentSettings, TournamentType, PokerTournament
-from backend.bot_manager import BotManager, BOT_TURN_TIMEOUT
+from backend.bot_manager import BotManager, BotWrapper, BOT_TURN_TIMEOUT
 from backend.engine.poker_game import PokerGame, PlayerAction
 
 # Import security systems
@@ -39,6 +40,9 @@ from match_scheduler import MatchScheduler
 # ============================================================================
 
 app = Flask(__name__)
+# nginx proxies to 127.0.0.1; take the client address from X-Forwarded-For
+# so per-IP login lockouts apply to the real client
+app.wsgi_app = ProxyFix(app.wsgi_app, x_for=1)
 CORS(app)
 
 # Security configuration - PRODUCTION READY
@@ -362,7 +366,7 @@ def get_my_pending_bots():
     """Get current user's pending bots that can be tested in custom table"""
     try:
         with review_system._lock:
-            review_system.submissions = review_system._load_submissions()
+            review_system._maybe_reload()
             pending = []
             for sub_id, sub in review_system.submissions["submissions"].items():
                 owner = sub.get("submitter_username")
@@ -447,7 +451,7 @@ def resubmit_bot(submission_id):
         # its stats, pull it from active play, and reset so the old version
         # doesn't keep competing
         with review_system._lock:
-            review_system.submissions = review_system._load_submissions()
+            review_system._maybe_reload()
             sub = review_system.submissions["submissions"].get(submission_id)
             if sub and sub["status"] == "approved":
                 bot_name = sub["bot_name"]
@@ -484,7 +488,7 @@ def get_bot_code(submission_id):
     """Get the current code for a user's bot (owner only)"""
     try:
         with review_system._lock:
-            review_system.submissions = review_system._load_submissions()
+            review_system._maybe_reload()
             if submission_id not in review_system.submissions["submissions"]:
                 return jsonify({'success': False, 'error': 'Submission not found'}), 404
 
@@ -519,7 +523,7 @@ def user_delete_bot(submission_id):
     """User deletes their own bot (removes from storage, submissions, and stats)"""
     try:
         with review_system._lock:
-            review_system.submissions = review_system._load_submissions()
+            review_system._maybe_reload()
             if submission_id not in review_system.submissions["submissions"]:
                 return jsonify({'success': False, 'error': 'Submission not found'}), 404
 
@@ -795,7 +799,7 @@ def admin_delete_bot(bot_name):
 
         # Remove from submissions and approved_bots
         with review_system._lock:
-            review_system.submissions = review_system._load_submissions()
+            review_system._maybe_reload()
             # Remove from approved_bots
             review_system.submissions["approved_bots"].pop(bot_name, None)
             # Remove any submission entries for this bot
@@ -806,8 +810,11 @@ def admin_delete_bot(bot_name):
             for sid in to_remove:
                 # Clean up code file
                 code_file = review_system.submissions["submissions"][sid].get("code_file")
-                if code_file and os.path.exists(code_file):
-                    os.remove(code_file)
+                if code_file:
+                    try:
+                        os.unlink(code_file)
+                    except FileNotFoundError:
+                        pass
                 del review_system.submissions["submissions"][sid]
             review_system._save_submissions()
 
@@ -914,8 +921,6 @@ def _clear_hand_state():
 def initialize_tournament():
     """Initialize a new tournament with APPROVED bots only"""
     try:
-        from backend.bot_manager import BotWrapper, BOT_TURN_TIMEOUT
-
         data = request.json
         selected_bot_names = data.get('bots', [])
 
@@ -961,7 +966,7 @@ def initialize_tournament():
                 sub_id = bot_name.split(':', 1)[1]
                 # Reload submissions from disk to get latest state
                 with review_system._lock:
-                    review_system.submissions = review_system._load_submissions()
+                    review_system._maybe_reload()
                 sub = review_system.submissions.get("submissions", {}).get(sub_id)
                 if not sub or sub["status"] != "pending_review":
                     logging.warning(f"Pending bot {sub_id}: submission not found or status={sub.get('status') if sub else 'N/A'}")
@@ -88,7 +88,7 @@ class BotWrapper:
                 action, amount = self.bot.get_action(game_state, hole_cards, legal_actions, min_bet, max_bet)
                 
                 # Validate action
-                if not isinstance(action, PlayerAction):
+                if type(action) is not PlayerAction:
                     raise BotError(f"Invalid action type: {type(action)}")
                 
                 if not isinstance(amount, (int, float)):
@@ -102,7 +102,7 @@ class BotWrapper:
                     return PlayerAction.FOLD, 0
                 
                 # Validate amount for raises
-                if action == PlayerAction.RAISE:
+                if action is PlayerAction.RAISE:
                     if amount < min_bet or amount > max_bet:
                         self.logger.warning(f"Bot {self.name} attempted invalid raise amount {amount}, folding instead")
                         return PlayerAction.FOLD, 0
@@ -33,6 +33,8 @@ class Rank(Enum):
 
 @dataclass
 class Card:
+    __slots__ = ('rank', 'suit')
+
     rank: Rank
     suit: Suit
 
@@ -50,7 +52,7 @@ class Card:
     def __eq__(self, other) -> bool:
         if not isinstance(other, Card):
             return False
-        return self.rank == other.rank and self.suit == other.suit
+        return self.rank is other.rank and self.suit is other.suit
 
     def __hash__(self) -> int:
         return hash((self.rank, self.suit))
@@ -80,20 +82,33 @@ class Deck:
         return len(self.cards)
 
 
+# Hand category strengths, usable directly in comparisons
+HIGH_CARD = 1
+PAIR = 2
+TWO_PAIR = 3
+THREE_OF_A_KIND = 4
+STRAIGHT = 5
+FLUSH = 6
+FULL_HOUSE = 7
+FOUR_OF_A_KIND = 8
+STRAIGHT_FLUSH = 9
+ROYAL_FLUSH = 10
+
+
 class HandEvaluator:
     """Evaluates poker hands and determines winners"""
 
     HAND_RANKINGS = {
-        'high_card': 1,
-        'pair': 2,
-        'two_pair': 3,
-        'three_of_a_kind': 4,
-        'straight': 5,
-        'flush': 6,
-        'full_house': 7,
-        'four_of_a_kind': 8,
-        'straight_flush': 9,
-        'royal_flush': 10
+        'high_card': HIGH_CARD,
+        'pair': PAIR,
+        'two_pair': TWO_PAIR,
+        'three_of_a_kind': THREE_OF_A_KIND,
+        'straight': STRAIGHT,
+        'flush': FLUSH,
+        'full_house': FULL_HOUSE,
+        'four_of_a_kind': FOUR_OF_A_KIND,
+        'straight_flush': STRAIGHT_FLUSH,
+        'royal_flush': ROYAL_FLUSH
     }
 
     @staticmethod
@@ -106,10 +121,9 @@ class HandEvaluator:
         if len(cards) != 5:
             raise ValueError("Hand must contain exactly 5 cards")
 
-        # Sort cards by rank (highest first)
-        sorted_cards = sorted(cards, key=lambda x: x.rank.value, reverse=True)
-        ranks = [card.rank.value for card in sorted_cards]
-        suits = [card.suit for card in sorted_cards]
+        # Extract rank values once and sort them (highest first)
+        ranks = sorted([card.rank.value for card in cards], reverse=True)
+        suits = [card.suit for card in cards]
 
         # Check for flush
         is_flush = len(set(suits)) == 1
@@ -167,7 +181,7 @@ class HandEvaluator:
         if sorted(ranks) == [2, 3, 4, 5, 14]:
             return True
         
-        unique_ranks = sorted(list(set(ranks)), reverse=True)
+        unique_ranks = sorted(set(ranks), reverse=True)
         if len(unique_ranks) < 5:
             return False
 
@@ -189,11 +203,12 @@ class HandEvaluator:
         best_hand_type = ''
         best_tiebreakers = []
         best_rank = -1
+        rankings = HandEvaluator.HAND_RANKINGS
 
         for hand_combination in combinations(all_cards, 5):
             hand_list = list(hand_combination)
             hand_type, tiebreakers = HandEvaluator.evaluate_hand(hand_list)
-            rank = HandEvaluator.HAND_RANKINGS[hand_type]
+            rank = rankings[hand_type]
 
             if rank > best_rank:
                 best_rank = rank
@@ -213,6 +228,72 @@ class HandEvaluator:
         
         return best_hand_type, best_tiebreakers, best_hand_combination
 
+    @staticmethod
+    def evaluate_hand_type(all_cards: List[Card]) -> str:
+        """
+        Determine only the best hand type from 5 or more cards.
+        Cheaper than evaluate_best_hand when tie-breakers and the best
+        five cards are not needed.
+        """
+        if len(all_cards) < 5:
+            raise ValueError("Must have at least 5 cards to evaluate.")
+
+        rank_counts = {}
+        suit_ranks = {}
+        for card in all_cards:
+            value = card.rank.value
+            rank_counts[value] = rank_counts.get(value, 0) + 1
+            suit_ranks.setdefault(card.suit, set()).add(value)
+
+        # With more than 9 cards several suits can hold a flush, so check
+        # every one for a straight flush
+        has_flush = False
+        straight_flush_high = 0
+        for ranks in suit_ranks.values():
+            if len(ranks) >= 5:
+                has_flush = True
+                straight_flush_high = max(straight_flush_high,
+                                          HandEvaluator._straight_high(ranks))
+
+        if straight_flush_high == Rank.ACE.value:
+            return 'royal_flush'
+        if straight_flush_high:
+            return 'straight_flush'
+
+        counts = sorted(rank_counts.values(), reverse=True)
+
+        if counts[0] == 4:
+            return 'four_of_a_kind'
+        if counts[0] == 3 and counts[1] >= 2:
+            return 'full_house'
+        if has_flush:
+            return 'flush'
+        if HandEvaluator._straight_high(rank_counts):
+            return 'straight'
+        if counts[0] == 3:
+            return 'three_of_a_kind'
+        if counts[0] == 2 and counts[1] == 2:
+            return 'two_pair'
+        if counts[0] == 2:
+            return 'pair'
+        return 'high_card'
+
+    @staticmethod
+    def _straight_high(ranks) -> int:
+        """Return the high card of the best straight in ranks, or 0 if none"""
+        run = 0
+        for value in range(14, 1, -1):
+            if value in ranks:
+                run += 1
+                if run == 5:
+                    return value + 4
+            else:
+                run = 0
+        # Ace-low straight (A-2-3-4-5)
+        if run == 4 and 14 in ranks:
+            return 5
+        return 0
+
     @staticmethod
     def get_winners(player_hands: List[Tuple[str, List[Card]]]) -> List[str]:
         """
@@ -231,6 +312,7 @@ class HandEvaluator:
 
         winners = []
         best_hand_so_far = None
+        rankings = HandEvaluator.HAND_RANKINGS
 
         for player_id, hand_info in best_hands.items():
             if not best_hand_so_far:
@@ -238,8 +320,8 @@ class HandEvaluator:
                 winners = [player_id]
                 continue
 
-            hand_rank = HandEvaluator.HAND_RANKINGS[hand_info[0]]
-            best_rank = HandEvaluator.HAND_RANKINGS[best_hand_so_far[0]]
+            hand_rank = rankings[hand_info[0]]
+            best_rank = rankings[best_hand_so_far[0]]
 
             if hand_rank > best_rank:
                 best_hand_so_far = hand_info
@@ -19,6 +19,10 @@ class PlayerAction(Enum):
 
 @dataclass
 class GameState:
+    __slots__ = ('pot', 'community_cards', 'current_bet', 'player_chips', 'player_bets',
+                 'active_players', 'current_player', 'round_name', 'min_bet',
+                 'min_raise', 'big_blind', 'small_blind')
+
     pot: int
     community_cards: List[Card]
     current_bet: int
@@ -303,18 +307,18 @@ class PokerGame:
         player_bet = game_state.player_bets[player_name]
         to_call = game_state.current_bet - player_bet
         
-        if action == PlayerAction.FOLD:
+        if action is PlayerAction.FOLD:
             return True
-        elif action == PlayerAction.CHECK:
+        elif action is PlayerAction.CHECK:
             return to_call == 0
-        elif action == PlayerAction.CALL:
+        elif action is PlayerAction.CALL:
             return to_call > 0 and player_chips >= to_call
-        elif action == PlayerAction.RAISE:
+        elif action is PlayerAction.RAISE:
             min_raise = game_state.min_bet
             return (amount >= min_raise and 
                     player_chips >= (amount - player_bet) and
                     amount > game_state.current_bet)
-        elif action == PlayerAction.ALL_IN:
+        elif action is PlayerAction.ALL_IN:
             return player_chips > 0
         
         return False
@@ -331,7 +335,7 @@ class PokerGame:
         player_bet = self.player_bets[player]
         to_call = self.current_bet - player_bet
         
-        if action == PlayerAction.FOLD:
+        if action is PlayerAction.FOLD:
             self.folded_players.append(player)
             if player in self.active_players:
                 self.active_players.remove(player)
@@ -340,10 +344,10 @@ class PokerGame:
                 self.current_player_index -= 1
             self.logger.info(f"  {player} folds")
         
-        elif action == PlayerAction.CHECK:
+        elif action is PlayerAction.CHECK:
             self.logger.info(f"  {player} checks")
         
-        elif action == PlayerAction.CALL:
+        elif action is PlayerAction.CALL:
             call_amount = min(to_call, self.player_chips[player])
             self.player_bets[player] += call_amount
             self.player_chips[player] -= call_amount
@@ -351,7 +355,7 @@ class PokerGame:
             self.total_pot_contributions[player] += call_amount
             self.logger.info(f"  {player} calls {call_amount}")
         
-        elif action == PlayerAction.RAISE:
+        elif action is PlayerAction.RAISE:
             raise_total = amount
             raise_amount = raise_total - self.player_bets[player]
 
@@ -369,7 +373,7 @@ class PokerGame:
             if actual_raise >= self.min_raise:
                 self.min_raise = actual_raise
             
-            if action == PlayerAction.ALL_IN:
+            if action is PlayerAction.ALL_IN:
                 self.logger.info(f"  {player} goes all-in with {raise_amount}")
                 if self.player_bets[player] > self.current_bet:
                     self.current_bet = self.player_bets[player]
@@ -381,7 +385,7 @@ class PokerGame:
             self.players_acted.add(player)
 
 
-        elif action == PlayerAction.ALL_IN:
+        elif action is PlayerAction.ALL_IN:
             all_in_amount = self.player_chips[player]
             self.player_bets[player] += all_in_amount
             self.player_chips[player] = 0
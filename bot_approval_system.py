@@ -12,6 +12,7 @@ import logging
 import sys
 import importlib.util
 import types
+import traceback
 from threading import RLock
 
 # Ensure bot code imports like "from bot_api import PokerBotAPI" resolve correctly
@@ -24,6 +25,9 @@ sys.modules.setdefault('engine', backend.engine)
 sys.modules.setdefault('engine.poker_game', backend.engine.poker_game)
 sys.modules.setdefault('engine.cards', backend.engine.cards)
 
+from backend.bot_api import PokerBotAPI
+from secure_bot_storage import SecureBotStorage, compile_bot_code
+
 
 class BotStatus(Enum):
     PENDING_REVIEW = "pending_review"
@@ -32,6 +36,13 @@ class BotStatus(Enum):
     REVISION_REQUESTED = "revision_requested"
 
 
+# Status groups used in membership checks
+_OPEN_STATUSES = frozenset({BotStatus.PENDING_REVIEW.value,
+                            BotStatus.REVISION_REQUESTED.value})
+_RESUBMITTABLE_STATUSES = frozenset({BotStatus.REVISION_REQUESTED.value,
+                                     BotStatus.APPROVED.value})
+
+
 class BotReviewSystem:
     """Manages bot submissions, reviews, and approvals"""
     
@@ -50,16 +61,21 @@ class BotReviewSystem:
         # since _save_submissions is called from methods that already hold the lock)
         self._lock = RLock()
         
+        # mtime of submissions.json as of our last read/write, used to skip
+        # redundant reloads when nothing else has touched the file
+        self._submissions_mtime = None
         self.submissions = self._load_submissions()
+        self._rebuild_index()
         
         # Initialize logger
         self.logger = logging.getLogger("bot_review_system")
-        self.logger.info(f"Bot Review System initialized: {review_directory}")
+        self.logger.info("Bot Review System initialized: %s", review_directory)
     
     def _load_submissions(self) -> Dict:
         """Load submission metadata (thread-safe)"""
         if os.path.exists(self.submissions_file):
             try:
+                mtime = os.stat(self.submissions_file).st_mtime_ns
                 with open(self.submissions_file, 'r', encoding='utf-8') as f:
                     data = json.load(f)
                     
@@ -68,21 +84,55 @@ class BotReviewSystem:
                     data["submissions"] = {}
                 if "approved_bots" not in data:
                     data["approved_bots"] = {}
-                    
+
+                self._submissions_mtime = mtime
                 return data
             except (json.JSONDecodeError, IOError) as e:
-                self.logger.error(f"Error loading submissions file: {str(e)}")
+                self.logger.error("Error loading submissions file: %s", e)
                 # Corrupted file, create backup and start fresh
                 if os.path.exists(self.submissions_file):
                     backup_file = f"{self.submissions_file}.backup_{int(datetime.now().timestamp())}"
                     try:
                         os.rename(self.submissions_file, backup_file)
-                        self.logger.warning(f"Corrupted file backed up to {backup_file}")
+                        self.logger.warning("Corrupted file backed up to %s", backup_file)
                     except:
                         pass
+                self._submissions_mtime = None
                 return {"submissions": {}, "approved_bots": {}}
         
+        self._submissions_mtime = None
         return {"submissions": {}, "approved_bots": {}}
+
+    def _maybe_reload(self):
+        """Reload submission metadata only if the file changed on disk
+        since we last read or wrote it"""
+        with self._lock:
+            try:
+                mtime = os.stat(self.submissions_file).st_mtime_ns
+            except OSError:
+                mtime = None
+            if mtime != self._submissions_mtime:
+                self.submissions = self._load_submissions()
+                self._rebuild_index()
+
+    def _rebuild_index(self):
+        """Index submission IDs by submitter and by status so the read paths
+        don't have to scan every record"""
+        by_user = {}
+        by_status = {}
+        for sub_id, sub in self.submissions["submissions"].items():
+            by_user.setdefault(sub.get("submitter_username"), []).append(sub_id)
+            by_status.setdefault(sub["status"], []).append(sub_id)
+        self._subs_by_user = by_user
+        self._subs_by_status = by_status
+
+    def _indexed_submissions(self, index: Dict, key: str):
+        """Yield (sub_id, sub) pairs for one key of an index"""
+        subs = self.submissions["submissions"]
+        for sub_id in index.get(key, ()):
+            sub = subs.get(sub_id)
+            if sub is not None:
+                yield sub_id, sub
     
     def _save_submissions(self):
         """Save submission metadata (thread-safe, atomic write)"""
@@ -98,10 +148,15 @@ class BotReviewSystem:
                     os.replace(temp_file, self.submissions_file)
                 else:
                     os.rename(temp_file, self.submissions_file)
-                    
+
+                self._submissions_mtime = os.stat(self.submissions_file).st_mtime_ns
+                self._rebuild_index()
                 self.logger.debug("Submissions metadata saved successfully")
             except Exception as e:
-                self.logger.error(f"Failed to save submissions metadata: {str(e)}")
+                self.logger.error("Failed to save submissions metadata: %s", e)
+                # Force the next _maybe_reload() to re-read the file so the
+                # unsaved in-memory change is discarded
+                self._submissions_mtime = None
                 # Try to clean up temp file
                 if os.path.exists(temp_file):
                     try:
@@ -115,11 +170,10 @@ class BotReviewSystem:
         """
         Submit a bot for review (tied to a user account)
         """
-        self.logger.info(f"New bot submission attempt: {bot_name} from {submitter_username}")
+        self.logger.info("New bot submission attempt: %s from %s", bot_name, submitter_username)
 
         with self._lock:
-            # Reload submissions to get latest data
-            self.submissions = self._load_submissions()
+            self._maybe_reload()
 
             # Check if bot name is taken by another user
             if bot_name in self.submissions["approved_bots"]:
@@ -131,8 +185,7 @@ class BotReviewSystem:
             for sub_id, sub in self.submissions["submissions"].items():
                 if (sub["bot_name"] == bot_name and
                     sub.get("submitter_username") == submitter_username and
-                    sub["status"] in [BotStatus.PENDING_REVIEW.value,
-                                     BotStatus.REVISION_REQUESTED.value]):
+                    sub["status"] in _OPEN_STATUSES):
                     return {
                         "success": False,
                         "error": f"You already have a pending submission for '{bot_name}'",
@@ -140,8 +193,9 @@ class BotReviewSystem:
                     }
 
             # Generate submission ID
+            now = datetime.now().isoformat()
             submission_id = hashlib.sha256(
-                f"{bot_name}{submitter_username}{datetime.now().isoformat()}".encode()
+                f"{bot_name}{submitter_username}{now}".encode()
             ).hexdigest()[:12]
 
             try:
@@ -154,7 +208,7 @@ class BotReviewSystem:
                 self.submissions["submissions"][submission_id] = {
                     "bot_name": bot_name,
                     "submitter_username": submitter_username,
-                    "submission_date": datetime.now().isoformat(),
+                    "submission_date": now,
                     "status": BotStatus.PENDING_REVIEW.value,
                     "code_file": code_file,
                     "review_notes": [],
@@ -162,7 +216,7 @@ class BotReviewSystem:
                 }
                 self._save_submissions()
 
-                self.logger.info(f"Bot submission successful: {bot_name} (ID: {submission_id})")
+                self.logger.info("Bot submission successful: %s (ID: %s)", bot_name, submission_id)
 
                 result = {
                     "success": True,
@@ -172,7 +226,7 @@ class BotReviewSystem:
                 }
 
             except Exception as e:
-                self.logger.error(f"Failed to submit bot {bot_name}: {str(e)}")
+                self.logger.error("Failed to submit bot %s: %s", bot_name, e)
                 return {
                     "success": False,
                     "error": f"Submission failed: {str(e)}"
@@ -185,12 +239,13 @@ class BotReviewSystem:
         self.logger.debug("Retrieving pending submissions")
         
         with self._lock:
-            # Reload to get latest data
-            self.submissions = self._load_submissions()
+            self._maybe_reload()
             
             pending = []
             
-            for sub_id, sub in self.submissions["submissions"].items():
+            pending_subs = self._indexed_submissions(self._subs_by_status,
+                                                     BotStatus.PENDING_REVIEW.value)
+            for sub_id, sub in pending_subs:
                 if sub["status"] == BotStatus.PENDING_REVIEW.value:
                     try:
                         # Read the code for review
@@ -211,13 +266,13 @@ class BotReviewSystem:
                             "review_notes": sub["review_notes"]
                         })
                     except FileNotFoundError:
-                        self.logger.warning(f"Code file not found for submission {sub_id}")
+                        self.logger.warning("Code file not found for submission %s", sub_id)
                     except Exception as e:
-                        self.logger.error(f"Error loading submission {sub_id}: {str(e)}")
+                        self.logger.error("Error loading submission %s: %s", sub_id, e)
             
             # Sort by submission date (oldest first)
             pending.sort(key=lambda x: x["submission_date"])
-            self.logger.info(f"Retrieved {len(pending)} pending submissions")
+            self.logger.info("Retrieved %s pending submissions", len(pending))
             return pending
     
     def get_all_submissions_admin(self) -> List[Dict]:
@@ -225,16 +280,18 @@ class BotReviewSystem:
         self.logger.debug("Retrieving all submissions for admin")
         
         with self._lock:
-            # Reload to get latest data
-            self.submissions = self._load_submissions()
+            self._maybe_reload()
             
             all_subs = []
-            
+
+            # One directory scan instead of a stat per submission
+            present = self._list_review_files()
+
             for sub_id, sub in self.submissions["submissions"].items():
                 try:
                     code = None
                     # Only load code if file still exists (pending/revision)
-                    if os.path.exists(sub["code_file"]):
+                    if self._review_file_exists(sub["code_file"], present):
                         with open(sub["code_file"], 'r', encoding='utf-8') as f:
                             code = f.read()
                     
@@ -257,13 +314,28 @@ class BotReviewSystem:
                         "rejection_date": sub.get("rejection_date")
                     })
                 except Exception as e:
-                    self.logger.error(f"Error loading submission {sub_id}: {str(e)}")
+                    self.logger.error("Error loading submission %s: %s", sub_id, e)
             
             # Sort by submission date (newest first for admin)
             all_subs.sort(key=lambda x: x["submission_date"], reverse=True)
-            self.logger.info(f"Retrieved {len(all_subs)} total submissions")
+            self.logger.info("Retrieved %s total submissions", len(all_subs))
             return all_subs
     
+    def _list_review_files(self) -> set:
+        """Names of all files currently in the review directory"""
+        try:
+            with os.scandir(self.review_directory) as entries:
+                return {entry.name for entry in entries}
+        except OSError:
+            return set()
+
+    def _review_file_exists(self, code_file: str, present: set) -> bool:
+        """Check a submission's code file against a _list_review_files() snapshot"""
+        if os.path.dirname(code_file) == self.review_directory:
+            return os.path.basename(code_file) in present
+        # File lives outside the scanned directory - fall back to a stat
+        return os.path.exists(code_file)
+
     def _run_automated_checks(self, code: str) -> Dict:
         """Run automated safety checks on bot code"""
         flags = []
@@ -360,20 +432,13 @@ class BotReviewSystem:
                 sys.path.insert(0, current_path)
             
             # Try to compile the code
-            compile(code, bot_name, 'exec')
+            compiled = compile_bot_code(code, bot_name)
             
             # Try to load it as a module
             module = types.ModuleType(bot_name)
             
             # Execute the code in the module's namespace
-            exec(code, module.__dict__)
-            
-            # Import PokerBotAPI to check inheritance
-            try:
-                from bot_api import PokerBotAPI
-            except ImportError:
-                # Try alternative import
-                from backend.bot_api import PokerBotAPI
+            exec(compiled, module.__dict__)
             
             # Find PokerBotAPI subclass
             bot_class = None
@@ -428,14 +493,13 @@ class BotReviewSystem:
     
     def approve_bot(self, submission_id: str, admin_notes: str = "") -> Dict:
         """Approve a bot submission (ADMIN ONLY) - FIXED VALIDATION"""
-        self.logger.info(f"Approving bot submission: {submission_id}")
+        self.logger.info("Approving bot submission: %s", submission_id)
         
         with self._lock:
-            # Reload to get latest data
-            self.submissions = self._load_submissions()
+            self._maybe_reload()
             
             if submission_id not in self.submissions["submissions"]:
-                self.logger.warning(f"Submission not found: {submission_id}")
+                self.logger.warning("Submission not found: %s", submission_id)
                 return {"success": False, "error": "Submission not found"}
             
             submission = self.submissions["submissions"][submission_id]
@@ -448,7 +512,7 @@ class BotReviewSystem:
                 # VALIDATE CODE BEFORE APPROVING
                 validation = self._validate_bot_code(bot_code, submission["bot_name"])
                 if not validation["valid"]:
-                    self.logger.error(f"Bot validation failed: {validation['error']}")
+                    self.logger.error("Bot validation failed: %s", validation['error'])
                     return {
                         "success": False,
                         "error": f"Bot validation failed: {validation['error']}"
@@ -460,7 +524,6 @@ class BotReviewSystem:
                     return {"success": False, "error": "MASTER_PASSWORD not configured on server"}
 
                 # Encrypt and store using the secure storage system
-                from secure_bot_storage import SecureBotStorage
                 storage = SecureBotStorage(self.approved_directory)
 
                 # Use update if bot already exists in storage (resubmission),
@@ -479,15 +542,16 @@ class BotReviewSystem:
                     )
 
                 if not result["success"]:
-                    self.logger.error(f"Failed to upload bot to storage: {result.get('error')}")
+                    self.logger.error("Failed to upload bot to storage: %s", result.get('error'))
                     return result
                 
                 # Update submission status
+                now = datetime.now().isoformat()
                 submission["status"] = BotStatus.APPROVED.value
-                submission["approval_date"] = datetime.now().isoformat()
+                submission["approval_date"] = now
                 submission["admin_notes"] = admin_notes
                 submission["review_notes"].append({
-                    "date": datetime.now().isoformat(),
+                    "date": now,
                     "action": "approved",
                     "notes": admin_notes
                 })
@@ -504,7 +568,7 @@ class BotReviewSystem:
                 # Clean up review files
                 self._cleanup_submission_files(submission_id)
                 
-                self.logger.info(f"Bot approved successfully: {submission['bot_name']}")
+                self.logger.info("Bot approved successfully: %s", submission['bot_name'])
                 
                 result = {
                     "success": True,
@@ -512,8 +576,7 @@ class BotReviewSystem:
                 }
                 
             except Exception as e:
-                self.logger.error(f"Error approving bot {submission_id}: {str(e)}")
-                import traceback
+                self.logger.error("Error approving bot %s: %s", submission_id, e)
                 self.logger.error(traceback.format_exc())
                 return {
                     "success": False,
@@ -524,23 +587,24 @@ class BotReviewSystem:
     
     def reject_bot(self, submission_id: str, reason: str) -> Dict:
         """Reject a bot submission (ADMIN ONLY)"""
-        self.logger.info(f"Rejecting bot submission: {submission_id}")
+        self.logger.info("Rejecting bot submission: %s", submission_id)
         
         with self._lock:
-            self.submissions = self._load_submissions()
+            self._maybe_reload()
             
             if submission_id not in self.submissions["submissions"]:
-                self.logger.warning(f"Submission not found: {submission_id}")
+                self.logger.warning("Submission not found: %s", submission_id)
                 return {"success": False, "error": "Submission not found"}
             
             submission = self.submissions["submissions"][submission_id]
             
             try:
+                now = datetime.now().isoformat()
                 submission["status"] = BotStatus.REJECTED.value
-                submission["rejection_date"] = datetime.now().isoformat()
+                submission["rejection_date"] = now
                 submission["rejection_reason"] = reason
                 submission["review_notes"].append({
-                    "date": datetime.now().isoformat(),
+                    "date": now,
                     "action": "rejected",
                     "notes": reason
                 })
@@ -550,10 +614,10 @@ class BotReviewSystem:
                 # Clean up files
                 self._cleanup_submission_files(submission_id)
                 
-                self.logger.info(f"Bot rejected: {submission['bot_name']}")
+                self.logger.info("Bot rejected: %s", submission['bot_name'])
                 
             except Exception as e:
-                self.logger.error(f"Error rejecting bot {submission_id}: {str(e)}")
+                self.logger.error("Error rejecting bot %s: %s", submission_id, e)
                 return {
                     "success": False,
                     "error": f"Rejection failed: {str(e)}"
@@ -566,13 +630,13 @@ class BotReviewSystem:
     
     def request_revision(self, submission_id: str, feedback: str) -> Dict:
         """Request revisions to a bot submission (ADMIN ONLY)"""
-        self.logger.info(f"Requesting revision for submission: {submission_id}")
+        self.logger.info("Requesting revision for submission: %s", submission_id)
         
         with self._lock:
-            self.submissions = self._load_submissions()
+            self._maybe_reload()
             
             if submission_id not in self.submissions["submissions"]:
-                self.logger.warning(f"Submission not found: {submission_id}")
+                self.logger.warning("Submission not found: %s", submission_id)
                 return {"success": False, "error": "Submission not found"}
             
             submission = self.submissions["submissions"][submission_id]
@@ -588,10 +652,10 @@ class BotReviewSystem:
                 
                 self._save_submissions()
                 
-                self.logger.info(f"Revision requested for: {submission['bot_name']}")
+                self.logger.info("Revision requested for: %s", submission['bot_name'])
                 
             except Exception as e:
-                self.logger.error(f"Error requesting revision for {submission_id}: {str(e)}")
+                self.logger.error("Error requesting revision for %s: %s", submission_id, e)
                 return {
                     "success": False,
                     "error": f"Request failed: {str(e)}"
@@ -605,10 +669,10 @@ class BotReviewSystem:
     def resubmit_bot(self, submission_id: str, new_code: str,
                      submitter_username: str) -> Dict:
         """User resubmits after revision request or updates an approved bot"""
-        self.logger.info(f"Bot resubmission: {submission_id}")
+        self.logger.info("Bot resubmission: %s", submission_id)
 
         with self._lock:
-            self.submissions = self._load_submissions()
+            self._maybe_reload()
 
             if submission_id not in self.submissions["submissions"]:
                 return {"success": False, "error": "Submission not found"}
@@ -620,8 +684,7 @@ class BotReviewSystem:
                 return {"success": False, "error": "Unauthorized"}
 
             # Allow resubmission from revision_requested or approved status
-            allowed = [BotStatus.REVISION_REQUESTED.value, BotStatus.APPROVED.value]
-            if submission["status"] not in allowed:
+            if submission["status"] not in _RESUBMITTABLE_STATUSES:
                 return {"success": False, "error": "This submission cannot be updated right now"}
 
             try:
@@ -632,19 +695,20 @@ class BotReviewSystem:
                 submission["code_file"] = code_file
 
                 # Reset to pending review
+                now = datetime.now().isoformat()
                 submission["status"] = BotStatus.PENDING_REVIEW.value
-                submission["resubmission_date"] = datetime.now().isoformat()
+                submission["resubmission_date"] = now
                 submission["review_notes"].append({
-                    "date": datetime.now().isoformat(),
+                    "date": now,
                     "action": "resubmitted",
                     "notes": "Code updated by submitter"
                 })
 
                 self._save_submissions()
-                self.logger.info(f"Bot resubmitted successfully: {submission['bot_name']}")
+                self.logger.info("Bot resubmitted successfully: %s", submission['bot_name'])
 
             except Exception as e:
-                self.logger.error(f"Error resubmitting bot {submission_id}: {str(e)}")
+                self.logger.error("Error resubmitting bot %s: %s", submission_id, e)
                 return {"success": False, "error": f"Resubmission failed: {str(e)}"}
 
         return {"success": True, "message": "Bot resubmitted for review"}
@@ -652,7 +716,7 @@ class BotReviewSystem:
     def withdraw_submission(self, submission_id: str, submitter_username: str) -> Dict:
         """User withdraws a pending submission"""
         with self._lock:
-            self.submissions = self._load_submissions()
+            self._maybe_reload()
 
             if submission_id not in self.submissions["submissions"]:
                 return {"success": False, "error": "Submission not found"}
@@ -672,18 +736,18 @@ class BotReviewSystem:
             del self.submissions["submissions"][submission_id]
             self._save_submissions()
 
-            self.logger.info(f"Submission withdrawn: {submission['bot_name']} by {submitter_username}")
+            self.logger.info("Submission withdrawn: %s by %s", submission['bot_name'], submitter_username)
 
         return {"success": True, "message": "Submission withdrawn"}
     
     def get_user_submissions(self, username: str) -> List[Dict]:
         """Get all submissions for a user by username"""
         with self._lock:
-            self.submissions = self._load_submissions()
+            self._maybe_reload()
 
             user_subs = []
 
-            for sub_id, sub in self.submissions["submissions"].items():
+            for sub_id, sub in self._indexed_submissions(self._subs_by_user, username):
                 sub_owner = sub.get("submitter_username")
                 if sub_owner == username:
                     user_subs.append({
@@ -700,9 +764,10 @@ class BotReviewSystem:
     def _cleanup_submission_files(self, submission_id: str):
         """Remove plaintext code file after approval/rejection"""
         file_path = os.path.join(self.review_directory, f"{submission_id}.py")
-        if os.path.exists(file_path):
-            try:
-                os.remove(file_path)
-                self.logger.debug(f"Cleaned up file: {file_path}")
-            except Exception as e:
-                self.logger.error(f"Failed to remove file {file_path}: {str(e)}")
\ No newline at end of file
+        try:
+            os.unlink(file_path)
+            self.logger.debug("Cleaned up file: %s", file_path)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            self.logger.error("Failed to remove file %s: %s", file_path, e)
\ No newline at end of file
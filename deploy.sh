@@ -191,6 +191,7 @@ mkdir -p "$BACKUP_DIR"
 
 tar -czf "$BACKUP_DIR/backup_$DATE.tar.gz" \
     "$APP_DIR/admin_auth.json" \
+    "$APP_DIR/admin_audit.log" \
     "$APP_DIR/bot_reviews" \
     "$APP_DIR/encrypted_bots" \
     "$APP_DIR/logs" \
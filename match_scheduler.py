@@ -395,7 +395,7 @@ class MatchScheduler:
                     # Track VPIP/PFR (preflop only)
                     if phase == 'preflop' and action in (PlayerAction.CALL, PlayerAction.RAISE, PlayerAction.ALL_IN):
                         preflop_actors.add(pid)
-                        if action == PlayerAction.RAISE:
+                        if action is PlayerAction.RAISE:
                             preflop_raisers.add(pid)
 
                     game.process_action(pid, action, amount)
@@ -547,8 +547,7 @@ class MatchScheduler:
 
         # Take the bots with fewest games, add some randomness
         top = available[:table_size + 2]
-        random.shuffle(top)
-        return top[:table_size]
+        return random.sample(top, table_size)
 
     def _scheduler_loop(self):
         """Main loop that runs in a background thread."""
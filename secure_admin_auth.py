@@ -2,13 +2,24 @@
 Secure Admin Authentication System
 Multiple layers of security for admin panel access
 """
+import copy
 import hashlib
+import hmac
 import secrets
 import time
 from flask_login import UserMixin
 from datetime import datetime
 import json
 import os
+from collections import deque
+from threading import Lock, RLock
+
+# Audit log entries kept after trimming; the file is allowed to grow to
+# twice this before it is rewritten
+AUDIT_LOG_MAX_ENTRIES = 1000
+
+# Failed-attempt counters kept before sub-threshold entries are forgotten
+MAX_TRACKED_ATTEMPTS = 10000
 
 
 class User(UserMixin):
@@ -22,11 +33,22 @@ class User(UserMixin):
 class AdminAuthSystem:
     """Manages admin authentication with multiple security layers"""
 
-    def __init__(self, auth_file: str = "admin_auth.json"):
+    def __init__(self, auth_file: str = "admin_auth.json", audit_file: str = "admin_audit.log"):
         self.auth_file = auth_file
-        self.rate_limit_storage = {}  # IP -> [timestamps]
-        self.failed_attempts = {}  # IP -> count
-        self.lockout_until = {}  # IP -> timestamp
+        self.audit_file = audit_file
+        self._audit_lock = Lock()
+        self._auth_data = None
+        self._auth_stamp = None  # (mtime_ns, size) of the file _auth_data came from
+        # Guards the cache and writes to auth_file; held across each
+        # load-modify-save so concurrent updates aren't lost
+        self._auth_lock = RLock()
+        self.rate_limit_storage = {}  # IP -> deque of timestamps, oldest first
+        self.failed_attempts = {}  # IP or "user:<name>" -> count
+        self.lockout_until = {}  # IP or "user:<name>" -> timestamp
+        self._attempts_lock = Lock()  # Guards the three dicts above
+        # Verified against for unknown usernames so they cost the same PBKDF2
+        # time as real ones
+        self._dummy_hash = self._hash_password(secrets.token_hex(16))
 
         # Initialize auth file if doesn't exist
         if not os.path.exists(auth_file):
@@ -36,6 +58,9 @@ class AdminAuthSystem:
             # matches it — handles cases where the env var changed after
             # the auth file was first created.
             self._sync_admin_password()
+            self._migrate_audit_log()
+
+        self._audit_entries = self._count_audit_entries()
 
     def _sync_admin_password(self):
         """Re-hash the default admin password if ADMIN_PASSWORD env var is set
@@ -69,8 +94,7 @@ class AdminAuthSystem:
                     "is_active": True
                 }
             },
-            "sessions": {},
-            "audit_log": []
+            "sessions": {}
         }
 
         with open(self.auth_file, 'w') as f:
@@ -97,33 +121,99 @@ class AdminAuthSystem:
         try:
             salt, hash_value = password_hash.split('$')
             pwd_hash = hashlib.pbkdf2_hmac('sha256', password.encode(), salt.encode(), 100000)
-            return pwd_hash.hex() == hash_value
+            return hmac.compare_digest(pwd_hash, bytes.fromhex(hash_value))
         except Exception:
             return False
 
+    def _file_stamp(self) -> tuple:
+        """Return (mtime_ns, size) of the auth file"""
+        st = os.stat(self.auth_file)
+        return st.st_mtime_ns, st.st_size
+
     def _load_auth_data(self) -> dict:
-        """Load authentication data"""
-        with open(self.auth_file, 'r') as f:
-            return json.load(f)
+        """Load authentication data (re-parsed only when the file changes).
+        Returns a private copy, so callers may mutate it before saving."""
+        with self._auth_lock:
+            stamp = self._file_stamp()
+            if self._auth_data is None or stamp != self._auth_stamp:
+                with open(self.auth_file, 'r') as f:
+                    self._auth_data = json.load(f)
+                self._auth_stamp = stamp
+            return copy.deepcopy(self._auth_data)
 
     def _save_auth_data(self, data: dict):
-        """Save authentication data"""
-        with open(self.auth_file, 'w') as f:
-            json.dump(data, f, indent=2)
+        """Save authentication data (thread-safe, atomic write)"""
+        with self._auth_lock:
+            temp_file = f"{self.auth_file}.tmp"
+            try:
+                with open(temp_file, 'w') as f:
+                    json.dump(data, f, indent=2)
+                os.replace(temp_file, self.auth_file)
+            except Exception:
+                # Force a re-read so the cache never holds unsaved changes
+                self._auth_data = None
+                raise
+            self._auth_data = copy.deepcopy(data)
+            self._auth_stamp = self._file_stamp()
+
+    def _migrate_audit_log(self):
+        """Move audit entries stored in the auth file into the audit log file"""
+        data = self._load_auth_data()
+        if "audit_log" not in data:
+            return
+
+        entries = data.pop("audit_log")
+        if entries:
+            with open(self.audit_file, 'a', encoding='utf-8') as f:
+                f.writelines(json.dumps(entry) + "\n" for entry in entries)
+        self._save_auth_data(data)
+
+    def _read_audit_entries(self) -> list:
+        """Read all entries from the audit log file"""
+        entries = []
+        try:
+            with open(self.audit_file, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        entries.append(json.loads(line))
+                    except ValueError:
+                        continue  # Skip a partially written line
+        except FileNotFoundError:
+            pass
+        return entries
+
+    def _count_audit_entries(self) -> int:
+        """Count lines in the audit log file"""
+        try:
+            with open(self.audit_file, 'rb') as f:
+                return sum(1 for _ in f)
+        except FileNotFoundError:
+            return 0
+
+    def _trim_audit_log(self):
+        """Rewrite the audit log keeping only the most recent entries"""
+        entries = self._read_audit_entries()[-AUDIT_LOG_MAX_ENTRIES:]
+        temp_file = f"{self.audit_file}.tmp"
+        with open(temp_file, 'w', encoding='utf-8') as f:
+            f.writelines(json.dumps(entry) + "\n" for entry in entries)
+        os.replace(temp_file, self.audit_file)
+        self._audit_entries = len(entries)
 
     def _log_audit_event(self, event_type: str, username: str, ip: str, details: str):
-        """Log security events"""
-        data = self._load_auth_data()
-        data["audit_log"].append({
+        """Log security events (appended as one JSON object per line)"""
+        line = json.dumps({
             "timestamp": datetime.now().isoformat(),
             "event": event_type,
             "username": username,
             "ip": ip,
             "details": details
-        })
-        # Keep only last 1000 events
-        data["audit_log"] = data["audit_log"][-1000:]
-        self._save_auth_data(data)
+        }) + "\n"
+        with self._audit_lock:
+            with open(self.audit_file, 'a', encoding='utf-8') as f:
+                f.write(line)
+            self._audit_entries += 1
+            if self._audit_entries > 2 * AUDIT_LOG_MAX_ENTRIES:
+                self._trim_audit_log()
 
     def check_rate_limit(self, ip: str, max_requests: int = 5, window_seconds: int = 60) -> bool:
         """
@@ -132,57 +222,82 @@ class AdminAuthSystem:
         """
         now = time.time()
 
-        # Clean old timestamps
-        if ip in self.rate_limit_storage:
-            self.rate_limit_storage[ip] = [
-                ts for ts in self.rate_limit_storage[ip]
-                if now - ts < window_seconds
-            ]
-        else:
-            self.rate_limit_storage[ip] = []
+        with self._attempts_lock:
+            timestamps = self.rate_limit_storage.get(ip)
+            if timestamps is None:
+                timestamps = self.rate_limit_storage[ip] = deque()
 
-        # Check if over limit
-        if len(self.rate_limit_storage[ip]) >= max_requests:
-            return False
+            # Drop expired timestamps from the old end
+            while timestamps and now - timestamps[0] >= window_seconds:
+                timestamps.popleft()
 
-        # Add current request
-        self.rate_limit_storage[ip].append(now)
-        return True
+            # Check if over limit
+            if len(timestamps) >= max_requests:
+                return False
+
+            # Add current request
+            timestamps.append(now)
+            return True
 
     def is_locked_out(self, ip: str) -> bool:
         """Check if IP is temporarily locked out"""
-        if ip in self.lockout_until:
-            if time.time() < self.lockout_until[ip]:
-                return True
-            else:
-                # Lockout expired
-                del self.lockout_until[ip]
-                self.failed_attempts[ip] = 0
-        return False
+        with self._attempts_lock:
+            if ip in self.lockout_until:
+                if time.time() < self.lockout_until[ip]:
+                    return True
+                else:
+                    # Lockout expired
+                    del self.lockout_until[ip]
+                    self.failed_attempts.pop(ip, None)
+            return False
 
     def record_failed_attempt(self, ip: str):
         """Record failed login attempt"""
-        self.failed_attempts[ip] = self.failed_attempts.get(ip, 0) + 1
+        with self._attempts_lock:
+            if ip not in self.failed_attempts and len(self.failed_attempts) >= MAX_TRACKED_ATTEMPTS:
+                # Keep only active lockouts so made-up usernames can't grow
+                # these dicts without bound
+                now = time.time()
+                self.lockout_until = {k: t for k, t in self.lockout_until.items() if t > now}
+                self.failed_attempts = {k: n for k, n in self.failed_attempts.items()
+                                        if k in self.lockout_until}
 
-        # Lock out after 5 failed attempts for 15 minutes
-        if self.failed_attempts[ip] >= 5:
-            self.lockout_until[ip] = time.time() + (15 * 60)
+            self.failed_attempts[ip] = self.failed_attempts.get(ip, 0) + 1
+
+            # Lock out after 5 failed attempts for 15 minutes
+            if self.failed_attempts[ip] >= 5:
+                self.lockout_until[ip] = time.time() + (15 * 60)
 
     def reset_failed_attempts(self, ip: str):
         """Reset failed attempts after successful login"""
-        if ip in self.failed_attempts:
-            del self.failed_attempts[ip]
+        with self._attempts_lock:
+            self.failed_attempts.pop(ip, None)
 
     def authenticate(self, username: str, password: str, ip: str) -> dict:
         """
         Authenticate admin user
         Returns: {"success": bool, "user": User or None, "error": str}
         """
+        # Refuse locked-out IPs before doing any other work
+        if self.is_locked_out(ip):
+            self._log_audit_event("LOGIN_FAIL", username, ip, "IP locked out")
+            return {"success": False, "error": "Too many failed attempts. Try again later."}
+
+        # Refuse locked-out usernames before spending time on PBKDF2
+        user_key = f"user:{username}"
+        if self.is_locked_out(user_key):
+            self._log_audit_event("LOGIN_FAIL", username, ip, "Username locked out")
+            return {"success": False, "error": "Too many failed attempts. Try again later."}
+
         # Load admin data
         data = self._load_auth_data()
 
-        # Check if user exists
+        # Check if user exists. Unknown names still run PBKDF2 and count
+        # toward a lockout, so neither timing nor lockouts reveal valid names
         if username not in data["admins"]:
+            self._verify_password(password, self._dummy_hash)
+            self.record_failed_attempt(ip)
+            self.record_failed_attempt(user_key)
             self._log_audit_event("LOGIN_FAIL", username, ip, "Invalid username")
             return {"success": False, "error": "Invalid credentials"}
 
@@ -195,12 +310,21 @@ class AdminAuthSystem:
 
         # Verify password
         if not self._verify_password(password, admin["password_hash"]):
+            self.record_failed_attempt(ip)
+            self.record_failed_attempt(user_key)
             self._log_audit_event("LOGIN_FAIL", username, ip, "Invalid password")
             return {"success": False, "error": "Invalid credentials"}
 
-        # Success - update last login
-        admin["last_login"] = datetime.now().isoformat()
-        self._save_auth_data(data)
+        self.reset_failed_attempts(ip)
+        self.reset_failed_attempts(user_key)
+
+        # Success - update last login on a fresh copy so logins don't
+        # overwrite concurrent account changes
+        with self._auth_lock:
+            data = self._load_auth_data()
+            if username in data["admins"]:
+                data["admins"][username]["last_login"] = datetime.now().isoformat()
+                self._save_auth_data(data)
 
         self._log_audit_event("LOGIN_SUCCESS", username, ip, "Successful login")
 
@@ -212,25 +336,26 @@ class AdminAuthSystem:
 
     def change_password(self, username: str, old_password: str, new_password: str) -> dict:
         """Change admin password"""
-        data = self._load_auth_data()
+        with self._auth_lock:
+            data = self._load_auth_data()
 
-        if username not in data["admins"]:
-            return {"success": False, "error": "User not found"}
+            if username not in data["admins"]:
+                return {"success": False, "error": "User not found"}
 
-        admin = data["admins"][username]
+            admin = data["admins"][username]
 
-        # Verify old password
-        if not self._verify_password(old_password, admin["password_hash"]):
-            return {"success": False, "error": "Invalid current password"}
+            # Verify old password
+            if not self._verify_password(old_password, admin["password_hash"]):
+                return {"success": False, "error": "Invalid current password"}
 
-        # Validate new password strength
-        if len(new_password) < 12:
-            return {"success": False, "error": "Password must be at least 12 characters"}
+            # Validate new password strength
+            if len(new_password) < 12:
+                return {"success": False, "error": "Password must be at least 12 characters"}
 
-        # Update password
-        admin["password_hash"] = self._hash_password(new_password)
-        admin["password_changed_at"] = datetime.now().isoformat()
-        self._save_auth_data(data)
+            # Update password
+            admin["password_hash"] = self._hash_password(new_password)
+            admin["password_changed_at"] = datetime.now().isoformat()
+            self._save_auth_data(data)
 
         self._log_audit_event("PASSWORD_CHANGE", username, "system", "Password changed")
 
@@ -238,22 +363,23 @@ class AdminAuthSystem:
 
     def create_admin(self, username: str, password: str, creator: str) -> dict:
         """Create new admin account"""
-        data = self._load_auth_data()
-
-        if username in data["admins"]:
-            return {"success": False, "error": "Username already exists"}
-
-        if len(password) < 12:
-            return {"success": False, "error": "Password must be at least 12 characters"}
-
-        data["admins"][username] = {
-            "password_hash": self._hash_password(password),
-            "created_at": datetime.now().isoformat(),
-            "created_by": creator,
-            "last_login": None,
-            "is_active": True
-        }
-        self._save_auth_data(data)
+        with self._auth_lock:
+            data = self._load_auth_data()
+
+            if username in data["admins"]:
+                return {"success": False, "error": "Username already exists"}
+
+            if len(password) < 12:
+                return {"success": False, "error": "Password must be at least 12 characters"}
+
+            data["admins"][username] = {
+                "password_hash": self._hash_password(password),
+                "created_at": datetime.now().isoformat(),
+                "created_by": creator,
+                "last_login": None,
+                "is_active": True
+            }
+            self._save_auth_data(data)
 
         self._log_audit_event("ADMIN_CREATED", username, "system", f"Created by {creator}")
 
@@ -261,5 +387,6 @@ class AdminAuthSystem:
 
     def get_audit_log(self, limit: int = 100) -> list:
         """Get recent audit log entries"""
-        data = self._load_auth_data()
-        return data["audit_log"][-limit:]
+        with self._audit_lock:
+            entries = self._read_audit_entries()
+        return entries[-limit:]
@@ -6,12 +6,16 @@ import os
 import sys
 import json
 import hashlib
+import hmac
+from collections import OrderedDict
+from functools import lru_cache
+from threading import Lock
 from cryptography.fernet import Fernet
 from cryptography.hazmat.primitives import hashes
 from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
 from cryptography.hazmat.backends import default_backend
 import base64
-from typing import Optional, List, Dict
+from typing import Optional, List, Dict, Tuple
 import types
 
 from backend.bot_api import PokerBotAPI
@@ -19,6 +23,15 @@ import backend.bot_api
 import backend.engine.poker_game
 import backend.engine.cards
 
+# Number of per-bot Fernet instances kept in memory
+CIPHER_CACHE_SIZE = 64
+
+# Length of the per-bot salt stored at the start of each .bot file
+SALT_SIZE = 16
+
+# Number of compiled bot code objects kept in memory
+CODE_CACHE_SIZE = 64
+
 # Register module aliases so bot code like "from bot_api import PokerBotAPI"
 # resolves to the same class objects as "from backend.bot_api import PokerBotAPI"
 sys.modules.setdefault('bot_api', backend.bot_api)
@@ -27,6 +40,12 @@ sys.modules.setdefault('engine.poker_game', backend.engine.poker_game)
 sys.modules.setdefault('engine.cards', backend.engine.cards)
 
 
+@lru_cache(maxsize=CODE_CACHE_SIZE)
+def compile_bot_code(code: str, bot_name: str):
+    """Compile bot source, reusing the code object for unchanged source"""
+    return compile(code, bot_name, 'exec')
+
+
 class SecureBotStorage:
     """Manages encrypted bot storage and execution"""
     
@@ -37,6 +56,11 @@ class SecureBotStorage:
         # Metadata file tracks bot names without exposing code
         self.metadata_file = os.path.join(storage_directory, "metadata.json")
         self.metadata = self._load_metadata()
+
+        # (salt, password fingerprint) -> Fernet, so repeated loads of the
+        # same bot skip PBKDF2 derivation and cipher setup
+        self._cipher_cache = OrderedDict()
+        self._cipher_cache_lock = Lock()
     
     def _load_metadata(self) -> Dict:
         """Load bot metadata (names, upload dates, etc.)"""
@@ -61,6 +85,65 @@ class SecureBotStorage:
         )
         key = base64.urlsafe_b64encode(kdf.derive(password.encode()))
         return key
+
+    def _decrypt(self, password: str, salt: bytes, encrypted_code: bytes) -> bytes:
+        """
+        Decrypt a stored bot, deriving its key only on a cache miss.
+        Ciphers are cached only after a successful decrypt, so wrong
+        passwords never take up cache slots.
+        """
+        cache_key = (salt, hmac.new(salt, password.encode(), hashlib.sha256).digest())
+        with self._cipher_cache_lock:
+            cipher = self._cipher_cache.get(cache_key)
+            if cipher is not None:
+                self._cipher_cache.move_to_end(cache_key)
+        if cipher is not None:
+            return cipher.decrypt(encrypted_code)
+
+        cipher = Fernet(self._generate_encryption_key(password, salt))
+        plaintext = cipher.decrypt(encrypted_code)  # Raises InvalidToken on a wrong password
+        with self._cipher_cache_lock:
+            self._cipher_cache[cache_key] = cipher
+            if len(self._cipher_cache) > CIPHER_CACHE_SIZE:
+                self._cipher_cache.popitem(last=False)
+        return plaintext
+
+    def _evict_cipher(self, bot_id: str):
+        """Drop cached ciphers for a stored bot before its files are removed"""
+        stored = self._read_encrypted_bot(bot_id)
+        if stored is None:
+            return
+        salt = stored[0]
+        with self._cipher_cache_lock:
+            for cache_key in [k for k in self._cipher_cache if k[0] == salt]:
+                del self._cipher_cache[cache_key]
+
+    def _bot_files(self, bot_id: str) -> List[str]:
+        """All files a stored bot may occupy (current and legacy layout)"""
+        return [
+            os.path.join(self.storage_directory, f"{bot_id}{ext}")
+            for ext in (".bot", ".enc", ".salt")
+        ]
+
+    def _read_encrypted_bot(self, bot_id: str) -> Optional[Tuple[bytes, bytes]]:
+        """Read (salt, encrypted_code) for a stored bot, or None if missing"""
+        blob_file = os.path.join(self.storage_directory, f"{bot_id}.bot")
+        try:
+            with open(blob_file, 'rb') as f:
+                blob = f.read()
+            return blob[:SALT_SIZE], blob[SALT_SIZE:]
+        except FileNotFoundError:
+            pass
+
+        # Legacy layout: salt and ciphertext in separate files
+        try:
+            with open(os.path.join(self.storage_directory, f"{bot_id}.salt"), 'rb') as f:
+                salt = f.read()
+            with open(os.path.join(self.storage_directory, f"{bot_id}.enc"), 'rb') as f:
+                encrypted_code = f.read()
+        except FileNotFoundError:
+            return None
+        return salt, encrypted_code
     
     def upload_bot(self, bot_name: str, bot_code: str, owner_password: str) -> Dict:
         """
@@ -83,7 +166,7 @@ class SecureBotStorage:
             return {"success": False, "error": validation_result["error"]}
         
         # Generate unique salt for this bot
-        salt = os.urandom(16)
+        salt = os.urandom(SALT_SIZE)
         encryption_key = self._generate_encryption_key(owner_password, salt)
         
         # Encrypt the bot code
@@ -93,15 +176,11 @@ class SecureBotStorage:
         # Generate bot ID (hash of encrypted code for verification)
         bot_id = hashlib.sha256(encrypted_code).hexdigest()[:16]
         
-        # Store encrypted bot
-        bot_file = os.path.join(self.storage_directory, f"{bot_id}.enc")
-        salt_file = os.path.join(self.storage_directory, f"{bot_id}.salt")
+        # Store salt and encrypted bot together in one file
+        bot_file = os.path.join(self.storage_directory, f"{bot_id}.bot")
         
         with open(bot_file, 'wb') as f:
-            f.write(encrypted_code)
-        
-        with open(salt_file, 'wb') as f:
-            f.write(salt)
+            f.write(salt + encrypted_code)
         
         # Update metadata
         self.metadata["bots"][bot_name] = {
@@ -135,13 +214,12 @@ class SecureBotStorage:
         
         # Delete old bot files
         old_bot_id = self.metadata["bots"][bot_name]["bot_id"]
-        old_files = [
-            os.path.join(self.storage_directory, f"{old_bot_id}.enc"),
-            os.path.join(self.storage_directory, f"{old_bot_id}.salt")
-        ]
-        for f in old_files:
-            if os.path.exists(f):
-                os.remove(f)
+        self._evict_cipher(old_bot_id)
+        for f in self._bot_files(old_bot_id):
+            try:
+                os.unlink(f)
+            except FileNotFoundError:
+                pass
         
         # Remove from metadata (will be re-added by upload)
         stats = self.metadata["bots"][bot_name].copy()
@@ -167,26 +245,16 @@ class SecureBotStorage:
             return None
         
         bot_id = self.metadata["bots"][bot_name]["bot_id"]
-        bot_file = os.path.join(self.storage_directory, f"{bot_id}.enc")
-        salt_file = os.path.join(self.storage_directory, f"{bot_id}.salt")
-        
-        if not os.path.exists(bot_file) or not os.path.exists(salt_file):
-            return None
         
         # Read salt and encrypted code
-        with open(salt_file, 'rb') as f:
-            salt = f.read()
-        
-        with open(bot_file, 'rb') as f:
-            encrypted_code = f.read()
-        
-        # Generate decryption key
-        encryption_key = self._generate_encryption_key(password, salt)
+        stored = self._read_encrypted_bot(bot_id)
+        if stored is None:
+            return None
+        salt, encrypted_code = stored
         
         try:
             # Decrypt
-            f = Fernet(encryption_key)
-            bot_code = f.decrypt(encrypted_code).decode()
+            bot_code = self._decrypt(password, salt, encrypted_code).decode()
             
             # Load bot from string (never touches disk)
             return self._load_bot_from_string(bot_code, bot_name)
@@ -200,21 +268,13 @@ class SecureBotStorage:
             return None
 
         bot_id = self.metadata["bots"][bot_name]["bot_id"]
-        bot_file = os.path.join(self.storage_directory, f"{bot_id}.enc")
-        salt_file = os.path.join(self.storage_directory, f"{bot_id}.salt")
-
-        if not os.path.exists(bot_file) or not os.path.exists(salt_file):
+        stored = self._read_encrypted_bot(bot_id)
+        if stored is None:
             return None
-
-        with open(salt_file, 'rb') as f:
-            salt = f.read()
-        with open(bot_file, 'rb') as f:
-            encrypted_code = f.read()
+        salt, encrypted_code = stored
 
         try:
-            encryption_key = self._generate_encryption_key(password, salt)
-            f = Fernet(encryption_key)
-            return f.decrypt(encrypted_code).decode()
+            return self._decrypt(password, salt, encrypted_code).decode()
         except Exception:
             return None
 
@@ -223,7 +283,7 @@ class SecureBotStorage:
         try:
             # Create a module from the code
             module = types.ModuleType(bot_name)
-            exec(code, module.__dict__)
+            exec(compile_bot_code(code, bot_name), module.__dict__)
             
             # Find PokerBotAPI subclass
             for attr_name in dir(module):
@@ -241,7 +301,7 @@ class SecureBotStorage:
         """Validate bot code before storing"""
         try:
             # Try to compile the code
-            compile(code, bot_name, 'exec')
+            compile_bot_code(code, bot_name)
             
             # Try to load it
             test_bot = self._load_bot_from_string(code, bot_name)
@@ -304,14 +364,13 @@ class SecureBotStorage:
         
         # Delete files
         bot_id = self.metadata["bots"][bot_name]["bot_id"]
-        files_to_delete = [
-            os.path.join(self.storage_directory, f"{bot_id}.enc"),
-            os.path.join(self.storage_directory, f"{bot_id}.salt")
-        ]
+        self._evict_cipher(bot_id)
         
-        for file_path in files_to_delete:
-            if os.path.exists(file_path):
-                os.remove(file_path)
+        for file_path in self._bot_files(bot_id):
+            try:
+                os.unlink(file_path)
+            except FileNotFoundError:
+                pass
         
         # Remove from metadata
         del self.metadata["bots"][bot_name]
@@ -3,6 +3,7 @@ User Authentication System
 Handles registration and login for regular users (bot submitters)
 """
 import hashlib
+import hmac
 import secrets
 import json
 import os
@@ -47,7 +48,7 @@ class UserAuthSystem:
         try:
             salt, hash_value = password_hash.split('$')
             pwd_hash = hashlib.pbkdf2_hmac('sha256', password.encode(), salt.encode(), 100000)
-            return pwd_hash.hex() == hash_value
+            return hmac.compare_digest(pwd_hash, bytes.fromhex(hash_value))
         except Exception:
             return False
 